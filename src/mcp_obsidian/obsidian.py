@@ -1,8 +1,22 @@
-import requests
+import asyncio
+import httpx
+import orjson
 import urllib.parse
 import os
+import socket
 from typing import Any
 
+_MARKDOWN_HEADERS = {'Content-Type': 'text/markdown'}
+_JSONLOGIC_HEADERS = {'Content-Type': 'application/vnd.olrapi.jsonlogic+json'}
+_DQL_HEADERS = {'Content-Type': 'application/vnd.olrapi.dataview.dql+txt'}
+_NOTE_JSON_HEADERS = {'Accept': 'application/vnd.olrapi.note+json'}
+
+# Requests are small and latency-bound, so don't let Nagle hold back writes
+_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
 class Obsidian():
     def __init__(
             self, 
@@ -11,6 +25,7 @@ class Obsidian():
             host: str = str(os.getenv('OBSIDIAN_HOST', '127.0.0.1')),
             port: int = int(os.getenv('OBSIDIAN_PORT', '27124')),
             verify_ssl: bool = False,
+            limits: httpx.Limits | None = None,
         ):
         self.api_key = api_key
         
@@ -22,7 +37,19 @@ class Obsidian():
         self.host = host
         self.port = port
         self.verify_ssl = verify_ssl
-        self.timeout = (3, 6)
+        self.timeout = httpx.Timeout(6, connect=3)
+        transport = httpx.AsyncHTTPTransport(
+            verify=self.verify_ssl,
+            http2=True,
+            limits=limits if limits is not None else httpx.Limits(),
+            socket_options=_SOCKET_OPTIONS,
+        )
+        self.client = httpx.AsyncClient(
+            base_url=self.get_base_url(),
+            headers=self._get_headers(),
+            timeout=self.timeout,
+            transport=transport,
+        )
 
     def get_base_url(self) -> str:
         return f'{self.protocol}://{self.host}:{self.port}'
@@ -33,52 +60,52 @@ class Obsidian():
         }
         return headers
 
-    def _safe_call(self, f) -> Any:
+    async def _safe_call(self, f) -> Any:
         try:
-            return f()
-        except requests.HTTPError as e:
-            error_data = e.response.json() if e.response.content else {}
+            return await f()
+        except httpx.HTTPStatusError as e:
+            error_data = orjson.loads(e.response.content) if e.response.content else {}
             code = error_data.get('errorCode', -1) 
             message = error_data.get('message', '<unknown>')
             raise Exception(f"Error {code}: {message}")
-        except requests.exceptions.RequestException as e:
+        except httpx.RequestError as e:
             raise Exception(f"Request failed: {str(e)}")
 
-    def list_files_in_vault(self) -> Any:
-        url = f"{self.get_base_url()}/vault/"
+    async def list_files_in_vault(self) -> Any:
+        url = "/vault/"
         
-        def call_fn():
-            response = requests.get(url, headers=self._get_headers(), verify=self.verify_ssl, timeout=self.timeout)
+        async def call_fn():
+            response = await self.client.get(url)
             response.raise_for_status()
             
-            return response.json()['files']
+            return orjson.loads(response.content)['files']
 
-        return self._safe_call(call_fn)
+        return await self._safe_call(call_fn)
 
         
-    def list_files_in_dir(self, dirpath: str) -> Any:
-        url = f"{self.get_base_url()}/vault/{dirpath}/"
+    async def list_files_in_dir(self, dirpath: str) -> Any:
+        url = f"/vault/{dirpath}/"
         
-        def call_fn():
-            response = requests.get(url, headers=self._get_headers(), verify=self.verify_ssl, timeout=self.timeout)
+        async def call_fn():
+            response = await self.client.get(url)
             response.raise_for_status()
             
-            return response.json()['files']
+            return orjson.loads(response.content)['files']
 
-        return self._safe_call(call_fn)
+        return await self._safe_call(call_fn)
 
-    def get_file_contents(self, filepath: str) -> Any:
-        url = f"{self.get_base_url()}/vault/{filepath}"
+    async def get_file_contents(self, filepath: str) -> Any:
+        url = f"/vault/{filepath}"
     
-        def call_fn():
-            response = requests.get(url, headers=self._get_headers(), verify=self.verify_ssl, timeout=self.timeout)
+        async def call_fn():
+            response = await self.client.get(url)
             response.raise_for_status()
             
             return response.text
 
-        return self._safe_call(call_fn)
+        return await self._safe_call(call_fn)
     
-    def get_batch_file_contents(self, filepaths: list[str]) -> str:
+    async def get_batch_file_contents(self, filepaths: list[str]) -> str:
         """Get contents of multiple files and concatenate them with headers.
         
         Args:
@@ -87,82 +114,93 @@ class Obsidian():
         Returns:
             String containing all file contents with headers
         """
+        # Bound the number of in-flight requests so large batches don't
+        # overwhelm the Obsidian process
+        semaphore = asyncio.Semaphore(16)
+
+        async def get_one(filepath: str) -> str:
+            async with semaphore:
+                return await self.get_file_contents(filepath)
+
+        contents = await asyncio.gather(
+            *(get_one(filepath) for filepath in filepaths),
+            return_exceptions=True
+        )
+
+        # Collect the pieces and join once at the end so each file body is
+        # copied a single time instead of once per f-string and again on join
         result = []
         
-        for filepath in filepaths:
-            try:
-                content = self.get_file_contents(filepath)
-                result.append(f"# {filepath}\n\n{content}\n\n---\n\n")
-            except Exception as e:
+        for filepath, content in zip(filepaths, contents):
+            result.append(f"# {filepath}\n\n")
+            if isinstance(content, Exception):
                 # Add error message but continue processing other files
-                result.append(f"# {filepath}\n\nError reading file: {str(e)}\n\n---\n\n")
+                result.append(f"Error reading file: {str(content)}")
+            else:
+                result.append(content)
+            result.append("\n\n---\n\n")
                 
         return "".join(result)
 
-    def search(self, query: str, context_length: int = 100) -> Any:
-        url = f"{self.get_base_url()}/search/simple/"
+    async def search(self, query: str, context_length: int = 100) -> Any:
+        url = "/search/simple/"
         params = {
             'query': query,
             'contextLength': context_length
         }
         
-        def call_fn():
-            response = requests.post(url, headers=self._get_headers(), params=params, verify=self.verify_ssl, timeout=self.timeout)
+        async def call_fn():
+            response = await self.client.post(url, params=params)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
 
-        return self._safe_call(call_fn)
+        return await self._safe_call(call_fn)
     
-    def append_content(self, filepath: str, content: str) -> Any:
-        url = f"{self.get_base_url()}/vault/{filepath}"
+    async def append_content(self, filepath: str, content: str) -> Any:
+        url = f"/vault/{filepath}"
         
-        def call_fn():
-            response = requests.post(
+        async def call_fn():
+            response = await self.client.post(
                 url, 
-                headers=self._get_headers() | {'Content-Type': 'text/markdown'}, 
-                data=content,
-                verify=self.verify_ssl,
-                timeout=self.timeout
+                headers=_MARKDOWN_HEADERS, 
+                content=content,
             )
             response.raise_for_status()
             return None
 
-        return self._safe_call(call_fn)
+        return await self._safe_call(call_fn)
     
-    def patch_content(self, filepath: str, operation: str, target_type: str, target: str, content: str) -> Any:
-        url = f"{self.get_base_url()}/vault/{filepath}"
+    async def patch_content(self, filepath: str, operation: str, target_type: str, target: str, content: str) -> Any:
+        url = f"/vault/{filepath}"
         
-        headers = self._get_headers() | {
-            'Content-Type': 'text/markdown',
+        headers = _MARKDOWN_HEADERS | {
             'Operation': operation,
             'Target-Type': target_type,
             'Target': urllib.parse.quote(target)
         }
         
-        def call_fn():
-            response = requests.patch(url, headers=headers, data=content, verify=self.verify_ssl, timeout=self.timeout)
+        async def call_fn():
+            response = await self.client.patch(url, headers=headers, content=content)
             response.raise_for_status()
             return None
 
-        return self._safe_call(call_fn)
+        return await self._safe_call(call_fn)
 
-    def put_content(self, filepath: str, content: str) -> Any:
-        url = f"{self.get_base_url()}/vault/{filepath}"
+    async def put_content(self, filepath: str, content: str) -> Any:
+        url = f"/vault/{filepath}"
         
-        def call_fn():
-            response = requests.put(
+        async def call_fn():
+            response = await self.client.put(
                 url, 
-                headers=self._get_headers() | {'Content-Type': 'text/markdown'}, 
-                data=content,
-                verify=self.verify_ssl,
-                timeout=self.timeout
+                headers=_MARKDOWN_HEADERS, 
+                content=content,
             )
             response.raise_for_status()
             return None
 
-        return self._safe_call(call_fn)
+        return await self._safe_call(call_fn)
     
-    def delete_file(self, filepath: str) -> Any:
+    async def delete_file(self, filepath: str) -> Any:
         """Delete a file or directory from the vault.
         
         Args:
@@ -171,30 +209,26 @@ class Obsidian():
         Returns:
             None on success
         """
-        url = f"{self.get_base_url()}/vault/{filepath}"
+        url = f"/vault/{filepath}"
         
-        def call_fn():
-            response = requests.delete(url, headers=self._get_headers(), verify=self.verify_ssl, timeout=self.timeout)
+        async def call_fn():
+            response = await self.client.delete(url)
             response.raise_for_status()
             return None
             
-        return self._safe_call(call_fn)
+        return await self._safe_call(call_fn)
     
-    def search_json(self, query: dict) -> Any:
-        url = f"{self.get_base_url()}/search/"
-        
-        headers = self._get_headers() | {
-            'Content-Type': 'application/vnd.olrapi.jsonlogic+json'
-        }
+    async def search_json(self, query: dict) -> Any:
+        url = "/search/"
         
-        def call_fn():
-            response = requests.post(url, headers=headers, json=query, verify=self.verify_ssl, timeout=self.timeout)
+        async def call_fn():
+            response = await self.client.post(url, headers=_JSONLOGIC_HEADERS, json=query)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
 
-        return self._safe_call(call_fn)
+        return await self._safe_call(call_fn)
     
-    def get_periodic_note(self, period: str, type: str = "content") -> Any:
+    async def get_periodic_note(self, period: str, type: str = "content") -> Any:
         """Get current periodic note for the specified period.
         
         Args:
@@ -206,20 +240,18 @@ class Obsidian():
         Returns:
             Content of the periodic note
         """
-        url = f"{self.get_base_url()}/periodic/{period}/"
+        url = f"/periodic/{period}/"
         
-        def call_fn():
-            headers = self._get_headers()
-            if type == "metadata":
-                headers['Accept'] = 'application/vnd.olrapi.note+json'
-            response = requests.get(url, headers=headers, verify=self.verify_ssl, timeout=self.timeout)
+        async def call_fn():
+            headers = _NOTE_JSON_HEADERS if type == "metadata" else None
+            response = await self.client.get(url, headers=headers)
             response.raise_for_status()
             
             return response.text
 
-        return self._safe_call(call_fn)
+        return await self._safe_call(call_fn)
     
-    def get_recent_periodic_notes(self, period: str, limit: int = 5, include_content: bool = False) -> Any:
+    async def get_recent_periodic_notes(self, period: str, limit: int = 5, include_content: bool = False) -> Any:
         """Get most recent periodic notes for the specified period type.
         
         Args:
@@ -230,27 +262,24 @@ class Obsidian():
         Returns:
             List of recent periodic notes
         """
-        url = f"{self.get_base_url()}/periodic/{period}/recent"
+        url = f"/periodic/{period}/recent"
         params = {
             "limit": limit,
             "includeContent": include_content
         }
         
-        def call_fn():
-            response = requests.get(
+        async def call_fn():
+            response = await self.client.get(
                 url, 
-                headers=self._get_headers(), 
-                params=params,
-                verify=self.verify_ssl, 
-                timeout=self.timeout
+                params=params
             )
             response.raise_for_status()
             
-            return response.json()
+            return orjson.loads(response.content)
 
-        return self._safe_call(call_fn)
+        return await self._safe_call(call_fn)
     
-    def get_recent_changes(self, limit: int = 10, days: int = 90) -> Any:
+    async def get_recent_changes(self, limit: int = 10, days: int = 90) -> Any:
         """Get recently modified files in the vault.
         
         Args:
@@ -272,20 +301,15 @@ class Obsidian():
         dql_query = "\n".join(query_lines)
         
         # Make the request to search endpoint
-        url = f"{self.get_base_url()}/search/"
-        headers = self._get_headers() | {
-            'Content-Type': 'application/vnd.olrapi.dataview.dql+txt'
-        }
+        url = "/search/"
         
-        def call_fn():
-            response = requests.post(
+        async def call_fn():
+            response = await self.client.post(
                 url,
-                headers=headers,
-                data=dql_query.encode('utf-8'),
-                verify=self.verify_ssl,
-                timeout=self.timeout
+                headers=_DQL_HEADERS,
+                content=dql_query.encode('utf-8'),
             )
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
 
-        return self._safe_call(call_fn)
+        return await self._safe_call(call_fn)
@@ -1,12 +1,17 @@
+import asyncio
+import collections
+import functools
+import httpx
 import json
 import logging
 import os
+import orjson
+import time
 from dotenv import load_dotenv
 from fastmcp import FastMCP
 
 load_dotenv()
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("mcp-obsidian")
 
 mcp = FastMCP("mcp-obsidian")
@@ -19,91 +24,295 @@ if not api_key:
         f"OBSIDIAN_API_KEY environment variable required. Working directory: {os.getcwd()}"
     )
 
-from . import obsidian
+_API = None
+
+
+def _get_api():
+    """Return the shared Obsidian client, importing and creating it on first use.
+
+    One async client (and its keep-alive pool) is shared across tool calls so
+    concurrent requests overlap on the event loop instead of queueing.
+    """
+    global _API
+    if _API is None:
+        from . import obsidian
+
+        _API = obsidian.Obsidian(
+            api_key=api_key,
+            host=obsidian_host,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+        )
+    return _API
+
+
+_PERIOD_NAMES = ("daily", "weekly", "monthly", "quarterly", "yearly")
+_PERIODS = frozenset(_PERIOD_NAMES)
+_PERIODS_HELP = ", ".join(_PERIOD_NAMES)
+_PTYPE_NAMES = ("content", "metadata")
+_PTYPES = frozenset(_PTYPE_NAMES)
+_PTYPES_HELP = ", ".join(_PTYPE_NAMES)
+
+# Shared read-only fallback for missing match positions; never mutated
+_EMPTY: dict = {}
+
+
+def _dump(obj) -> str:
+    """Serialize a tool result as indented JSON."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+
+_CACHES: list[dict] = []
+# Bumped on every invalidation so reads that were in flight across a write
+# don't repopulate the cache with pre-write results
+_CACHE_GENERATION = 0
+
+
+def _ttl_cache(ttl: float, key=None):
+    """Cache an async function's result for `ttl` seconds, keyed by its arguments.
+
+    `key` maps the arguments to a hashable cache key (default: the argument tuple).
+
+    All caches are dropped by `_invalidate_caches` whenever a tool writes to the vault.
+    """
+
+    def decorator(fn):
+        cache: dict = {}
+        _CACHES.append(cache)
+
+        @functools.wraps(fn)
+        async def wrapper(*args):
+            k = key(*args) if key is not None else args
+            now = time.monotonic()
+            hit = cache.get(k)
+            if hit is not None and hit[0] > now:
+                return hit[1]
+
+            generation = _CACHE_GENERATION
+            value = await fn(*args)
+            if generation != _CACHE_GENERATION:
+                return value
+
+            if len(cache) >= 128:
+                for stale in [s for s, (expiry, _) in cache.items() if expiry <= now]:
+                    del cache[stale]
+            cache[k] = (now + ttl, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def _invalidate_caches() -> None:
+    global _CACHE_GENERATION
+    _CACHE_GENERATION += 1
+    for cache in _CACHES:
+        cache.clear()
+
+
+def _join_appends(pieces: list[str]) -> str:
+    """Join consecutive appends the way the REST API would apply them one by one.
+
+    The API starts appended content on a new line when the file doesn't already
+    end with one, so pieces are separated by a newline likewise.
+    """
+    result = []
+    for piece in pieces:
+        if result and not result[-1].endswith("\n"):
+            result.append("\n")
+        if piece:
+            result.append(piece)
+    return "".join(result)
+
+
+class _AppendBatcher:
+    """Coalesce appends to the same file that arrive while another is in flight.
+
+    An append to a file with nothing pending or in flight is sent immediately.
+    Otherwise it waits `delay` seconds to collect further appends to that file,
+    which are then sent as one request once the earlier one completes.
+
+    Each caller waits on a future that resolves once the combined append
+    request for its file completes. Batches for the same file are sent in order.
+    A caller cancelled before its batch is sent has its content dropped.
+    """
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self._pending: collections.defaultdict[
+            str, list[tuple[str, asyncio.Future]]
+        ] = collections.defaultdict(list)
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def append(self, filepath: str, content: str) -> None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending[filepath]
+        entry = (content, future)
+        pending.append(entry)
+        if len(pending) == 1:
+            if filepath in self._inflight:
+                loop.call_later(self.delay, self._flush, filepath)
+            else:
+                self._flush(filepath)
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Only drop the content if its batch hasn't been flushed yet
+            if self._pending.get(filepath) is pending:
+                pending.remove(entry)
+            raise
+
+    def _flush(self, filepath: str) -> None:
+        batch = self._pending.pop(filepath, None)
+        if not batch:
+            # Every caller in the batch was cancelled before it was sent
+            return
+
+        previous = self._inflight.get(filepath)
+        task = asyncio.ensure_future(self._send(filepath, batch, previous))
+        self._inflight[filepath] = task
+
+        def done(t: asyncio.Task) -> None:
+            if self._inflight.get(filepath) is t:
+                del self._inflight[filepath]
+
+        task.add_done_callback(done)
+
+    async def _send(
+        self,
+        filepath: str,
+        batch: list[tuple[str, asyncio.Future]],
+        previous: asyncio.Task | None,
+    ) -> None:
+        try:
+            if previous is not None:
+                await asyncio.wait([previous])
+
+            await _get_api().append_content(
+                filepath, _join_appends([content for content, _ in batch])
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        except BaseException:
+            # Cancelled: don't leave the remaining callers waiting forever
+            for _, future in batch:
+                future.cancel()
+            raise
+        else:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+
+_APPENDS = _AppendBatcher()
+
+
+@_ttl_cache(2)
+async def _list_files_in_vault() -> str:
+    api = _get_api()
+    files = await api.list_files_in_vault()
+    return _dump(files)
+
+
+@_ttl_cache(2)
+async def _list_files_in_dir(dirpath: str) -> str:
+    api = _get_api()
+    files = await api.list_files_in_dir(dirpath)
+    return _dump(files)
+
+
+# json rather than orjson: the key must accept any valid query, including
+# integers outside orjson's 64-bit range
+@_ttl_cache(30, key=lambda query: json.dumps(query, sort_keys=True))
+async def _complex_search(query: dict) -> str:
+    api = _get_api()
+    results = await api.search_json(query)
+    return _dump(results)
 
 
 @mcp.tool()
-def obsidian_list_files_in_vault() -> str:
+async def obsidian_list_files_in_vault() -> str:
     """Lists all files and directories in the root directory of your Obsidian vault."""
-    api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
-    files = api.list_files_in_vault()
-    return json.dumps(files, indent=2)
+    return await _list_files_in_vault()
 
 
 @mcp.tool()
-def obsidian_list_files_in_dir(dirpath: str) -> str:
+async def obsidian_list_files_in_dir(dirpath: str) -> str:
     """Lists all files and directories that exist in a specific Obsidian directory.
 
     Args:
         dirpath: Path to list files from (relative to your vault root). Note that empty directories will not be returned.
     """
-    api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
-    files = api.list_files_in_dir(dirpath)
-    return json.dumps(files, indent=2)
+    return await _list_files_in_dir(dirpath)
 
 
 @mcp.tool()
-def obsidian_get_file_contents(filepath: str) -> str:
+async def obsidian_get_file_contents(filepath: str) -> str:
     """Return the content of a single file in your vault.
 
     Args:
         filepath: Path to the relevant file (relative to your vault root).
     """
-    api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
-    content = api.get_file_contents(filepath)
-    return json.dumps(content, indent=2)
+    api = _get_api()
+    content = await api.get_file_contents(filepath)
+    return _dump(content)
 
 
 @mcp.tool()
-def obsidian_simple_search(query: str, context_length: int = 100) -> str:
+async def obsidian_simple_search(query: str, context_length: int = 100) -> str:
     """Simple search for documents matching a specified text query across all files in the vault.
 
     Args:
         query: Text to search for in the vault.
         context_length: How much context to return around the matching string (default: 100)
     """
-    api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
-    results = api.search(query, context_length)
-
-    formatted_results = []
-    for result in results:
-        formatted_matches = []
-        for match in result.get("matches", []):
-            context = match.get("context", "")
-            match_pos = match.get("match", {})
-            start = match_pos.get("start", 0)
-            end = match_pos.get("end", 0)
-
-            formatted_matches.append(
-                {"context": context, "match_position": {"start": start, "end": end}}
-            )
-
-        formatted_results.append(
-            {
-                "filename": result.get("filename", ""),
-                "score": result.get("score", 0),
-                "matches": formatted_matches,
-            }
-        )
-
-    return json.dumps(formatted_results, indent=2)
+    api = _get_api()
+    results = await api.search(query, context_length)
+
+    formatted_results = [
+        {
+            "filename": result.get("filename", ""),
+            "score": result.get("score", 0),
+            "matches": [
+                {
+                    "context": match.get("context", ""),
+                    "match_position": {
+                        "start": (match_pos := match.get("match") or _EMPTY).get(
+                            "start", 0
+                        ),
+                        "end": match_pos.get("end", 0),
+                    },
+                }
+                for match in result.get("matches", ())
+            ],
+        }
+        for result in results
+    ]
+
+    return _dump(formatted_results)
 
 
 @mcp.tool()
-def obsidian_append_content(filepath: str, content: str) -> str:
+async def obsidian_append_content(filepath: str, content: str) -> str:
     """Append content to a new or existing file in the vault.
 
     Args:
         filepath: Path to the file (relative to vault root)
         content: Content to append to the file
     """
-    api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
-    api.append_content(filepath, content)
+    try:
+        await _APPENDS.append(filepath, content)
+    finally:
+        # The write may have landed even if the request failed on our side
+        _invalidate_caches()
     return f"Successfully appended content to {filepath}"
 
 
 @mcp.tool()
-def obsidian_patch_content(
+async def obsidian_patch_content(
     filepath: str, operation: str, target_type: str, target: str, content: str
 ) -> str:
     """Insert content into an existing note relative to a heading, block reference, or frontmatter field.
@@ -115,26 +324,32 @@ def obsidian_patch_content(
         target: Target identifier (heading path, block reference, or frontmatter field)
         content: Content to insert
     """
-    api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
-    api.patch_content(filepath, operation, target_type, target, content)
+    api = _get_api()
+    try:
+        await api.patch_content(filepath, operation, target_type, target, content)
+    finally:
+        _invalidate_caches()
     return f"Successfully patched content in {filepath}"
 
 
 @mcp.tool()
-def obsidian_put_content(filepath: str, content: str) -> str:
+async def obsidian_put_content(filepath: str, content: str) -> str:
     """Create a new file in your vault or update the content of an existing one.
 
     Args:
         filepath: Path to the relevant file (relative to your vault root)
         content: Content of the file you would like to upload
     """
-    api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
-    api.put_content(filepath, content)
+    api = _get_api()
+    try:
+        await api.put_content(filepath, content)
+    finally:
+        _invalidate_caches()
     return f"Successfully uploaded content to {filepath}"
 
 
 @mcp.tool()
-def obsidian_delete_file(filepath: str, confirm: bool = False) -> str:
+async def obsidian_delete_file(filepath: str, confirm: bool = False) -> str:
     """Delete a file or directory from the vault.
 
     Args:
@@ -144,19 +359,25 @@ def obsidian_delete_file(filepath: str, confirm: bool = False) -> str:
     if not confirm:
         raise RuntimeError("confirm must be set to true to delete a file")
 
-    api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
-    api.delete_file(filepath)
+    api = _get_api()
+    try:
+        await api.delete_file(filepath)
+    finally:
+        _invalidate_caches()
     return f"Successfully deleted {filepath}"
 
 
 @mcp.tool()
-def obsidian_complex_search(query: dict) -> str:
+async def obsidian_complex_search(query: dict) -> str:
     """Complex search for documents using a JsonLogic query.
 
     Supports standard JsonLogic operators plus 'glob' and 'regexp' for pattern matching.
     Results must be non-falsy. Use this tool when you want to do a complex search,
     e.g. for all documents with certain tags etc. ALWAYS follow query syntax in examples.
 
+    Results are cached for up to 30 seconds. Writes made through these tools clear
+    the cache, but edits made directly in Obsidian may take that long to show up.
+
     Examples:
     1. Match all markdown files:
        {"glob": ["*.md", {"var": "path"}]}
@@ -170,25 +391,23 @@ def obsidian_complex_search(query: dict) -> str:
     Args:
         query: JsonLogic query object following the syntax in examples
     """
-    api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
-    results = api.search_json(query)
-    return json.dumps(results, indent=2)
+    return await _complex_search(query)
 
 
 @mcp.tool()
-def obsidian_batch_get_file_contents(filepaths: list[str]) -> str:
+async def obsidian_batch_get_file_contents(filepaths: list[str]) -> str:
     """Return the contents of multiple files in your vault, concatenated with headers.
 
     Args:
         filepaths: List of file paths to read (relative to your vault root)
     """
-    api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
-    content = api.get_batch_file_contents(filepaths)
+    api = _get_api()
+    content = await api.get_batch_file_contents(filepaths)
     return content
 
 
 @mcp.tool()
-def obsidian_get_periodic_note(period: str, type: str = "content") -> str:
+async def obsidian_get_periodic_note(period: str, type: str = "content") -> str:
     """Get current periodic note for the specified period.
 
     Args:
@@ -196,25 +415,21 @@ def obsidian_get_periodic_note(period: str, type: str = "content") -> str:
         type: The type of data to get ('content' or 'metadata'). 'content' returns just the content
               in Markdown format. 'metadata' includes note metadata (including paths, tags, etc.) and the content.
     """
-    valid_periods = ["daily", "weekly", "monthly", "quarterly", "yearly"]
-    if period not in valid_periods:
+    if period not in _PERIODS:
         raise RuntimeError(
-            f"Invalid period: {period}. Must be one of: {', '.join(valid_periods)}"
+            f"Invalid period: {period}. Must be one of: {_PERIODS_HELP}"
         )
 
-    valid_types = ["content", "metadata"]
-    if type not in valid_types:
-        raise RuntimeError(
-            f"Invalid type: {type}. Must be one of: {', '.join(valid_types)}"
-        )
+    if type not in _PTYPES:
+        raise RuntimeError(f"Invalid type: {type}. Must be one of: {_PTYPES_HELP}")
 
-    api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
-    content = api.get_periodic_note(period, type)
+    api = _get_api()
+    content = await api.get_periodic_note(period, type)
     return content
 
 
 @mcp.tool()
-def obsidian_get_recent_periodic_notes(
+async def obsidian_get_recent_periodic_notes(
     period: str, limit: int = 5, include_content: bool = False
 ) -> str:
     """Get most recent periodic notes for the specified period type.
@@ -224,43 +439,38 @@ def obsidian_get_recent_periodic_notes(
         limit: Maximum number of notes to return (default: 5, max: 50)
         include_content: Whether to include note content (default: false)
     """
-    valid_periods = ["daily", "weekly", "monthly", "quarterly", "yearly"]
-    if period not in valid_periods:
+    if period not in _PERIODS:
         raise RuntimeError(
-            f"Invalid period: {period}. Must be one of: {', '.join(valid_periods)}"
+            f"Invalid period: {period}. Must be one of: {_PERIODS_HELP}"
         )
 
-    if not isinstance(limit, int) or limit < 1:
+    if limit < 1:
         raise RuntimeError(f"Invalid limit: {limit}. Must be a positive integer")
 
-    if not isinstance(include_content, bool):
-        raise RuntimeError(
-            f"Invalid include_content: {include_content}. Must be a boolean"
-        )
-
-    api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
-    results = api.get_recent_periodic_notes(period, limit, include_content)
-    return json.dumps(results, indent=2)
+    api = _get_api()
+    results = await api.get_recent_periodic_notes(period, limit, include_content)
+    return _dump(results)
 
 
 @mcp.tool()
-def obsidian_get_recent_changes(limit: int = 10, days: int = 90) -> str:
+async def obsidian_get_recent_changes(limit: int = 10, days: int = 90) -> str:
     """Get recently modified files in the vault.
 
     Args:
         limit: Maximum number of files to return (default: 10, max: 100)
         days: Only include files modified within this many days (default: 90)
     """
-    if not isinstance(limit, int) or limit < 1:
+    if limit < 1:
         raise RuntimeError(f"Invalid limit: {limit}. Must be a positive integer")
 
-    if not isinstance(days, int) or days < 1:
+    if days < 1:
         raise RuntimeError(f"Invalid days: {days}. Must be a positive integer")
 
-    api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
-    results = api.get_recent_changes(limit, days)
-    return json.dumps(results, indent=2)
+    api = _get_api()
+    results = await api.get_recent_changes(limit, days)
+    return _dump(results)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     mcp.run(transport="http", host="0.0.0.0", port=9000)
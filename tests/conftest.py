@@ -0,0 +1,4 @@
+import os
+
+# server.py refuses to import without an API key
+os.environ.setdefault("OBSIDIAN_API_KEY", "test-key")
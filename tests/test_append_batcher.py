@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from mcp_obsidian import server
+
+
+class FakeApi:
+    def __init__(self, delay: float = 0.0, fail: set[str] = frozenset()):
+        self.delay = delay
+        self.fail = fail
+        self.calls: list[tuple[str, str]] = []
+        self.events: list[tuple[str, str]] = []
+
+    async def append_content(self, filepath: str, content: str) -> None:
+        self.calls.append((filepath, content))
+        self.events.append(("start", content))
+        await asyncio.sleep(self.delay)
+        self.events.append(("end", content))
+        if filepath in self.fail:
+            raise Exception(f"Error 500: cannot append to {filepath}")
+
+
+@pytest.fixture
+def api(monkeypatch):
+    fake = FakeApi()
+    monkeypatch.setattr(server, "_get_api", lambda: fake)
+    return fake
+
+
+def test_uncontended_append_is_sent_immediately(api):
+    async def run():
+        batcher = server._AppendBatcher(delay=10)
+        await asyncio.wait_for(batcher.append("a.md", "1"), timeout=0.5)
+
+    asyncio.run(run())
+    assert api.calls == [("a.md", "1")]
+
+
+def test_coalesces_appends_while_one_is_in_flight(api):
+    api.delay = 0.02
+
+    async def run():
+        batcher = server._AppendBatcher(delay=0.01)
+        await asyncio.gather(
+            batcher.append("a.md", "1\n"),
+            batcher.append("b.md", "x\n"),
+            batcher.append("a.md", "2\n"),
+            batcher.append("a.md", "3\n"),
+        )
+
+    asyncio.run(run())
+    assert api.calls == [("a.md", "1\n"), ("b.md", "x\n"), ("a.md", "2\n3\n")]
+
+
+def test_coalesced_appends_are_separated_by_newlines():
+    assert server._join_appends(["foo", "bar"]) == "foo\nbar"
+    assert server._join_appends(["foo\n", "bar"]) == "foo\nbar"
+    assert server._join_appends(["foo", "", "bar"]) == "foo\nbar"
+    assert server._join_appends(["", "bar"]) == "bar"
+
+
+def test_batches_for_same_file_are_sent_in_order(api):
+    api.delay = 0.05
+
+    async def run():
+        batcher = server._AppendBatcher(delay=0.01)
+        first = asyncio.ensure_future(batcher.append("a.md", "1"))
+        # Let the first request start before queueing the next append
+        await asyncio.sleep(0.02)
+        await asyncio.gather(first, batcher.append("a.md", "2"))
+
+    asyncio.run(run())
+    assert api.events == [("start", "1"), ("end", "1"), ("start", "2"), ("end", "2")]
+
+
+def test_failure_propagates_to_every_caller_in_batch(api):
+    api.fail = {"a.md"}
+
+    async def run():
+        batcher = server._AppendBatcher(delay=0.01)
+        return await asyncio.gather(
+            batcher.append("a.md", "0"),
+            batcher.append("a.md", "1"),
+            batcher.append("a.md", "2"),
+            batcher.append("b.md", "x"),
+            return_exceptions=True,
+        )
+
+    _, first, second, other = asyncio.run(run())
+    assert isinstance(first, Exception) and "a.md" in str(first)
+    assert second is first
+    assert other is None
+
+
+def test_cancelled_caller_content_is_not_sent(api):
+    api.delay = 0.02
+
+    async def run():
+        batcher = server._AppendBatcher(delay=0.01)
+        inflight = asyncio.ensure_future(batcher.append("a.md", "0"))
+        await asyncio.sleep(0)
+        cancelled = asyncio.ensure_future(batcher.append("a.md", "1"))
+        kept = asyncio.ensure_future(batcher.append("a.md", "2"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(inflight, kept)
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+
+    asyncio.run(run())
+    assert api.calls == [("a.md", "0"), ("a.md", "2")]
+
+
+def test_cancelled_send_releases_waiters(api):
+    api.delay = 1
+
+    async def run():
+        batcher = server._AppendBatcher(delay=0.01)
+        asyncio.ensure_future(batcher.append("a.md", "0"))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.ensure_future(batcher.append("a.md", "1")),
+            asyncio.ensure_future(batcher.append("a.md", "2")),
+        ]
+        # Let the second batch flush and queue behind the slow first request
+        await asyncio.sleep(0.02)
+        batcher._inflight["a.md"].cancel()
+        return await asyncio.wait_for(
+            asyncio.gather(*waiters, return_exceptions=True), timeout=0.5
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from mcp_obsidian import server
+
+
+class FakeApi:
+    def __init__(self):
+        self.files = ["old.md"]
+        self.gate: asyncio.Event | None = None
+        self.calls = 0
+
+    async def list_files_in_vault(self) -> list[str]:
+        self.calls += 1
+        files = list(self.files)
+        if self.gate is not None:
+            await self.gate.wait()
+        return files
+
+    async def put_content(self, filepath: str, content: str) -> None:
+        # The write reaches the vault but the response never makes it back
+        self.files.append(filepath)
+        raise Exception("Request failed: ReadTimeout")
+
+    async def search_json(self, query: dict) -> list[dict]:
+        self.calls += 1
+        return [{"filename": "note.md", "result": True}]
+
+
+@pytest.fixture
+def api(monkeypatch):
+    fake = FakeApi()
+    monkeypatch.setattr(server, "_get_api", lambda: fake)
+    server._invalidate_caches()
+    yield fake
+    server._invalidate_caches()
+
+
+def test_listing_is_cached_until_invalidated(api):
+    async def run():
+        await server._list_files_in_vault()
+        await server._list_files_in_vault()
+        server._invalidate_caches()
+        await server._list_files_in_vault()
+
+    asyncio.run(run())
+    assert api.calls == 2
+
+
+def test_read_in_flight_across_write_is_not_cached(api):
+    async def run():
+        api.gate = asyncio.Event()
+        listing = asyncio.ensure_future(server._list_files_in_vault())
+        await asyncio.sleep(0)
+
+        # A write lands while the listing is still waiting on the API
+        api.files.append("new.md")
+        server._invalidate_caches()
+        api.gate.set()
+        await listing
+
+        return await server._list_files_in_vault()
+
+    assert "new.md" in asyncio.run(run())
+
+
+def test_failed_write_still_invalidates_caches(api):
+    async def run():
+        await server._list_files_in_vault()
+        with pytest.raises(Exception, match="ReadTimeout"):
+            await server.obsidian_put_content.fn("new.md", "content")
+        return await server._list_files_in_vault()
+
+    assert "new.md" in asyncio.run(run())
+
+
+def test_complex_search_key_ignores_key_order(api):
+    async def run():
+        await server._complex_search({"and": [1], "or": [2]})
+        await server._complex_search({"or": [2], "and": [1]})
+
+    asyncio.run(run())
+    assert api.calls == 1
+
+
+def test_complex_search_accepts_integers_beyond_64_bits(api):
+    query = {"==": [{"var": "size"}, 2**64]}
+    result = asyncio.run(server._complex_search(query))
+    assert "note.md" in result